@@ -55,18 +55,42 @@ import select
 
 log = logging.getLogger(__name__)
 
+# Max bytes pulled from serial per stream iteration
+READ_CHUNK = 512
+
+# Q-channel fill (DC center) for interleave_iq
+_Q_FILL = bytes([127]) * READ_CHUNK
+
+
+def interleave_iq(raw: bytes, dst: bytearray) -> int:
+    """Write `raw` into `dst` as (I=byte, Q=127) pairs; return bytes written."""
+    n = len(raw)
+    dst[0:2 * n:2] = raw
+    dst[1:2 * n:2] = _Q_FILL[:n]
+    return 2 * n
+
+
+# USB vendor IDs of the USB-UART chips used with ESP32 boards
+USB_UART_VIDS = frozenset({
+    0x10C4,  # Silicon Labs CP210x
+    0x1A86,  # WCH CH340 / CH9102
+    0x0403,  # FTDI
+})
+
+# Description fallback for ports that don't report a VID
+USB_UART_NAMES = ('cp210', 'ch340', 'ch9102', 'ftdi')
+
 
 def find_evilcrow_port() -> str:
     """Auto-detect EvilCrow serial port (CP2102 / CH340 USB-UART)."""
     ports = serial.tools.list_ports.comports()
     for p in ports:
+        if p.vid is not None:
+            if p.vid in USB_UART_VIDS:
+                return p.device
+            continue
         desc = (p.description or '').lower()
-        vid = p.vid or 0
-        # Common USB-UART chips used with ESP32
-        if any(chip in desc for chip in ['cp210', 'ch340', 'ch9102', 'ftdi']):
-            return p.device
-        # Silicon Labs CP2102 (common on ESP32 devboards)
-        if vid == 0x10C4:
+        if any(chip in desc for chip in USB_UART_NAMES):
             return p.device
     # Fallback: return first port
     if ports:
@@ -74,20 +98,66 @@ def find_evilcrow_port() -> str:
     raise RuntimeError('No serial ports found. Is the device connected?')
 
 
+def send_buffers(sock: socket.socket, buffers) -> None:
+    """Send a sequence of buffers with sendall semantics.
+
+    Uses scatter-gather `sendmsg` where available (POSIX) so the kernel
+    gathers the pieces without a user-space concat; falls back to one
+    `sendall` per buffer on Windows.
+    """
+    if not hasattr(sock, 'sendmsg'):
+        for buf in buffers:
+            sock.sendall(buf)
+        return
+    views = [memoryview(buf).cast('B') for buf in buffers if len(buf)]
+    while views:
+        sent = sock.sendmsg(views)
+        while sent:
+            head = len(views[0])
+            if sent >= head:
+                sent -= head
+                views.pop(0)
+            else:
+                views[0] = views[0][sent:]
+                sent = 0
+
+
 class URHBridge:
     """RTL-TCP compatible bridge for EvilCrow RF v2."""
 
+    # Serial command templates — `%` on bytes skips the str/encode round-trip
+    _CMD_FREQ = b'set_freq %d\n'
+    _CMD_RATE = b'set_sample_rate %d\n'
+    _CMD_GAIN = b'set_gain %d\n'
+
     def __init__(self, serial_port: str, tcp_port: int = 1234):
         self.serial_port = serial_port
         self.tcp_port = tcp_port
         self.ser: serial.Serial = None
         self.server: socket.socket = None
         self.client: socket.socket = None
-        self.running = False
+        self._run = threading.Event()
 
     def log(self, msg: str):
         print(f'[{time.strftime("%H:%M:%S")}] {msg}')
 
+    def _read_reply(self, timeout: float) -> str:
+        """Read one multi-line firmware reply with a single blocking read.
+
+        Waits up to `timeout` for the first byte, then returns once the
+        line stream goes quiet for 50 ms (or 512 bytes have arrived).
+        """
+        prev_timeout = self.ser.timeout
+        prev_inter_byte = self.ser.inter_byte_timeout
+        self.ser.timeout = timeout
+        self.ser.inter_byte_timeout = 0.05
+        try:
+            resp = self.ser.read(512)
+        finally:
+            self.ser.inter_byte_timeout = prev_inter_byte
+            self.ser.timeout = prev_timeout
+        return resp.decode('ascii', errors='replace')
+
     def connect_device(self) -> bool:
         """Open serial connection to EvilCrow and enable SDR mode."""
         try:
@@ -99,11 +169,7 @@ class URHBridge:
             # Auto-enable SDR mode via serial (no app/phone needed)
             self.log('Enabling SDR mode via serial...')
             self.ser.write(b'sdr_enable\n')
-            time.sleep(0.5)
-            resp = b''
-            while self.ser.in_waiting:
-                resp += self.ser.read(self.ser.in_waiting)
-            resp_str = resp.decode('ascii', errors='replace')
+            resp_str = self._read_reply(0.5)
 
             if 'SUCCESS' in resp_str.upper():
                 self.log('SDR mode enabled.')
@@ -113,11 +179,7 @@ class URHBridge:
 
             # Verify device
             self.ser.write(b'board_id_read\n')
-            time.sleep(0.3)
-            resp = b''
-            while self.ser.in_waiting:
-                resp += self.ser.read(self.ser.in_waiting)
-            resp_str = resp.decode('ascii', errors='replace')
+            resp_str = self._read_reply(0.3)
 
             if 'HACKRF' not in resp_str.upper():
                 self.log(f'Device did not respond as EvilCrow SDR.')
@@ -128,11 +190,11 @@ class URHBridge:
             self.log('Device connected and SDR mode verified.')
 
             # Set initial config
-            self.ser.write(b'set_freq 433920000\n')
+            self.ser.write(self._CMD_FREQ % 433920000)
             time.sleep(0.1)
-            self.ser.write(b'set_sample_rate 250000\n')
+            self.ser.write(self._CMD_RATE % 250000)
             time.sleep(0.1)
-            self.ser.write(b'set_gain 15\n')
+            self.ser.write(self._CMD_GAIN % 15)
             time.sleep(0.1)
             # Drain responses
             self.ser.reset_input_buffer()
@@ -166,45 +228,57 @@ class URHBridge:
 
         if cmd == 0x01:  # Set frequency
             self.log(f'  Freq: {param} Hz ({param/1e6:.3f} MHz)')
-            self.ser.write(f'set_freq {param}\n'.encode())
+            self.ser.write(self._CMD_FREQ % param)
         elif cmd == 0x02:  # Set sample rate
             self.log(f'  Rate: {param} Hz')
-            self.ser.write(f'set_sample_rate {param}\n'.encode())
+            self.ser.write(self._CMD_RATE % param)
         elif cmd == 0x04:  # Set gain
             gain = param // 10
             self.log(f'  Gain: {gain} dB')
-            self.ser.write(f'set_gain {gain}\n'.encode())
+            self.ser.write(self._CMD_GAIN % gain)
         elif cmd == 0x05:  # Set gain mode (auto/manual)
             pass  # CC1101 always uses AGC
         else:
             self.log(f'  Unknown RTL cmd: 0x{cmd:02X} param={param}')
 
-    def stream_data(self):
-        """Read CC1101 FIFO data and stream to URH as 8-bit unsigned IQ."""
+    def stream_data(self, client: socket.socket, run_event: threading.Event):
+        """Read CC1101 FIFO data and stream to URH as 8-bit unsigned IQ.
+
+        Runs until `run_event` is cleared or `client` disconnects.
+        """
         self.log('Starting RX and data stream...')
         self.ser.write(b'rx_start\n')
         time.sleep(0.2)
         self.ser.reset_input_buffer()
 
+        iq_buf = bytearray(2 * READ_CHUNK)
+        iq_view = memoryview(iq_buf)  # zero-copy slices for send
+        silence = bytes([127, 127]) * 64  # 64 silent samples
         sample_count = 0
-        last_log = time.time()
+        next_log = time.monotonic() + 5.0
+
+        # Bind hot-loop lookups to locals once
+        ser = self.ser
+        read = ser.read
+        send = send_buffers
+        interleave = interleave_iq
+        is_running = run_event.is_set
+        monotonic = time.monotonic
+        sleep = time.sleep
 
         try:
-            while self.running and self.client:
+            while is_running():
                 # Read available serial data from CC1101 FIFO
-                avail = self.ser.in_waiting
+                avail = ser.in_waiting
                 if avail > 0:
-                    raw = self.ser.read(min(avail, 512))
+                    raw = read(min(avail, READ_CHUNK))
                     if raw:
                         # Convert demodulated bytes to unsigned 8-bit IQ pairs.
                         # The CC1101 outputs demodulated bytes, not true IQ.
-                        # We send each byte as both I and Q (mono signal).
-                        iq_buf = bytearray(len(raw) * 2)
-                        for i, b in enumerate(raw):
-                            iq_buf[i * 2] = b       # I channel
-                            iq_buf[i * 2 + 1] = 127  # Q channel (DC center)
+                        # We send each byte as I with Q at DC center (127).
+                        n = interleave(raw, iq_buf)
                         try:
-                            self.client.sendall(iq_buf)
+                            send(client, (iq_view[:n],))
                             sample_count += len(raw)
                         except (BrokenPipeError, OSError):
                             self.log('Client disconnected during stream.')
@@ -212,18 +286,16 @@ class URHBridge:
                 else:
                     # No data available — send silence (center value) to keep
                     # URH's sample rate clock ticking
-                    silence = bytes([127, 127]) * 64  # 64 silent samples
                     try:
-                        self.client.sendall(silence)
+                        send(client, (silence,))
                     except (BrokenPipeError, OSError):
                         break
-                    time.sleep(0.005)
+                    sleep(0.005)
 
                 # Log progress every 5 seconds
-                now = time.time()
-                if now - last_log >= 5.0:
+                if monotonic() >= next_log:
                     self.log(f'  Streamed {sample_count} samples')
-                    last_log = now
+                    next_log += 5.0
 
         finally:
             try:
@@ -237,25 +309,32 @@ class URHBridge:
         """Handle a URH client connection."""
         self.client = client
         self.log(f'URH connected from {addr[0]}:{addr[1]}')
+        stream_t = None
 
         try:
             client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Larger socket buffers so the IQ stream doesn't stall on a
+            # full send buffer; quick ACKs keep the command path snappy.
+            client.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+            client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 17)
+            if hasattr(socket, 'TCP_QUICKACK'):  # Linux only
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
 
             # Send RTL-TCP DongleInfo header (12 bytes)
             # Magic: "RTL0" | Tuner type: uint32 | Gain count: uint32
-            header = b'RTL0' + struct.pack('>II', 1, 1)
-            client.sendall(header)
+            send_buffers(client, (b'RTL0', struct.pack('>II', 1, 1)))
             self.log('Sent RTL-TCP header (12 bytes)')
 
             time.sleep(0.1)
 
             # Start streaming in background thread
-            self.running = True
-            stream_t = threading.Thread(target=self.stream_data, daemon=True)
+            self._run.set()
+            stream_t = threading.Thread(target=self.stream_data,
+                                        args=(client, self._run), daemon=True)
             stream_t.start()
 
             # Handle commands from URH in main loop
-            while self.running:
+            while self._run.is_set():
                 try:
                     ready, _, _ = select.select([client], [], [], 1.0)
                     if ready:
@@ -271,8 +350,8 @@ class URHBridge:
                     break
 
         finally:
-            self.running = False
-            if stream_t.is_alive():
+            self._run.clear()
+            if stream_t is not None and stream_t.is_alive():
                 stream_t.join(timeout=2.0)
             try:
                 client.close()
@@ -300,7 +379,7 @@ class URHBridge:
             self.cleanup()
 
     def cleanup(self):
-        self.running = False
+        self._run.clear()
         if self.client:
             try:
                 self.client.close()
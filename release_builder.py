@@ -3,16 +3,17 @@
 EvilCrow RF V2 — Release Builder with GUI + CLI
 =================================================
 Creates firmware and/or app release packages with proper naming,
-versioning, MD5 hashes, and changelog generation.
+versioning, SHA-256/MD5 hashes, and changelog generation.
 
 Reads current versions from:
   - include/config.h          (firmware version)
   - mobile_app/pubspec.yaml   (app version)
 
 Outputs:
-  - releases/firmware/evilcrow-v2-fw-vX.Y.Z.bin + .bin.md5
+  - releases/firmware/evilcrow-v2-fw-vX.Y.Z.bin + .bin.sha256 + .bin.md5
   - releases/firmware/evilcrow-v2-fw-vX.Y.Z-full.bin (merged OTA-ready)
-  - releases/app/EvilCrowRF-vX.Y.Z.apk + .apk.md5
+  - releases/app/EvilCrowRF-vX.Y.Z.apk + .apk.sha256 + .apk.md5
+  - the .md5 sidecars are kept for the app's OTA updater
   - releases/changelog.json   (cumulative changelog)
 
 Usage:
@@ -23,16 +24,20 @@ Usage:
   python release_builder.py --fw --apk       # Build both (CLI)
   python release_builder.py --fw --test      # TEST BUILD (adds -TEST suffix, no version bump)
   python release_builder.py --fw --no-bump   # Release without version bump
+  python release_builder.py --fw --hash=blake3  # .blake3 instead of .sha256 (any hashlib name, or none)
   python release_builder.py --help           # Show help
 """
 
+import codecs
+import collections
+import functools
 import hashlib
 import json
 import os
 import platform
 import queue
 import re
-import shutil
+import selectors
 import subprocess
 import sys
 import threading
@@ -50,12 +55,18 @@ CHANGELOG_FILE = RELEASES_DIR / "changelog.json"
 FW_RELEASES_DIR = RELEASES_DIR / "firmware"
 APP_RELEASES_DIR = RELEASES_DIR / "app"
 PIO_BUILD_DIR = PROJECT_ROOT / ".pio" / "build" / "esp32dev"
+BOOT_APP0_CACHE = PROJECT_ROOT / ".pio" / ".ecrf_boot_app0_cache.json"
+MERGED_CACHE = PIO_BUILD_DIR / ".ecrf_merged_cache.json"
 
 
 # ─── GUI Root (set by launch_gui) ───────────────────────────────────
 
 _TK_ROOT = None
 
+# Command popup limits: lines kept in the widget / lines buffered between pumps
+POPUP_MAX_LINES = 5000
+POPUP_QUEUE_MAX = 10000
+
 
 def _ensure_tk_root_for_cli() -> bool:
     """Ensure a hidden Tk root exists for CLI popups.
@@ -83,6 +94,23 @@ def _set_tk_root(root):
     _TK_ROOT = root
 
 
+# Set by cli_release_both while its main thread pumps Tk without mainloop().
+# Worker threads may not touch Tk then (not even after()), so their popup
+# and prompt callables are queued here and run by that pump loop.
+_TK_CALLS: queue.Queue | None = None
+
+
+def _run_on_tk_thread(fn):
+    """Schedule fn on the Tk main thread from a worker thread."""
+    if _TK_CALLS is not None:
+        _TK_CALLS.put(fn)
+    else:
+        _TK_ROOT.after(0, fn)
+
+
+_PROMPT_LOCK = threading.Lock()
+
+
 def _prompt_continue_or_terminate(message: str, title: str = "Timeout") -> bool:
     """Ask the user whether to continue waiting.
 
@@ -108,13 +136,14 @@ def _prompt_continue_or_terminate(message: str, title: str = "Timeout") -> bool:
             finally:
                 evt.set()
 
-        _TK_ROOT.after(0, _ask)
+        _run_on_tk_thread(_ask)
         evt.wait()
         return bool(result_holder.get("answer", False))
 
-    # CLI fallback
+    # CLI fallback; one prompt at a time when both pipelines run at once
     try:
-        ans = input(f"{title}: {message} [y/N]: ").strip().lower()
+        with _PROMPT_LOCK:
+            ans = input(f"{title}: {message} [y/N]: ").strip().lower()
     except EOFError:
         return False
     return ans in ("y", "yes")
@@ -132,11 +161,20 @@ def _create_command_popup(title: str):
         if not _ensure_tk_root_for_cli():
             return None, stop_event, None
 
-    q: queue.Queue[str] = queue.Queue()
+    # Bounded: if the UI falls behind, the oldest lines are dropped in O(1)
+    pending: collections.deque[str] = collections.deque(maxlen=POPUP_QUEUE_MAX)
+    pending_lock = threading.Lock()
     created_evt = threading.Event()
     holder: dict[str, object] = {}
 
     def _create():
+        try:
+            _build()
+        finally:
+            # Never leave the worker waiting, even if the window failed
+            created_evt.set()
+
+    def _build():
         import tkinter as tk
         from tkinter import scrolledtext, ttk
 
@@ -174,29 +212,32 @@ def _create_command_popup(title: str):
         def _pump():
             if not win.winfo_exists():
                 return
-            try:
-                while True:
-                    line = q.get_nowait()
-                    text.insert(tk.END, line)
-                    text.see(tk.END)
-            except queue.Empty:
-                pass
+            with pending_lock:
+                lines = list(pending)
+                pending.clear()
+            if lines:
+                # One insert per tick, then trim the head to POPUP_MAX_LINES
+                text.insert(tk.END, "".join(lines))
+                excess = int(text.index("end-1c").split(".")[0]) - POPUP_MAX_LINES
+                if excess > 0:
+                    text.delete("1.0", f"{excess + 1}.0")
+                text.see(tk.END)
             win.after(80, _pump)
 
         _pump()
 
         holder["win"] = win
-        created_evt.set()
 
     # If we're on the Tk main thread (CLI popup mode), create synchronously.
     if threading.current_thread() is threading.main_thread():
         _create()
     else:
-        _TK_ROOT.after(0, _create)
+        _run_on_tk_thread(_create)
         created_evt.wait()
 
     def enqueue(line: str):
-        q.put(line)
+        with pending_lock:
+            pending.append(line)
 
     def close():
         def _close():
@@ -210,7 +251,7 @@ def _create_command_popup(title: str):
         if threading.current_thread() is threading.main_thread():
             _close()
         else:
-            _TK_ROOT.after(0, _close)
+            _run_on_tk_thread(_close)
 
     return enqueue, stop_event, close
 
@@ -251,8 +292,7 @@ def run_command_verbose(
         stderr=subprocess.STDOUT,
         stdin=subprocess.PIPE if stdin_data is not None else None,
         text=True,
-        bufsize=1,
-        universal_newlines=True,
+        bufsize=65536,  # chatty tools (flutter/pio): fewer, larger pipe reads
     )
 
     if stdin_data is not None and proc.stdin is not None:
@@ -266,23 +306,51 @@ def run_command_verbose(
         except Exception:
             pass
 
+    def _emit(line: str):
+        if enqueue:
+            enqueue(line)
+        if log_callback:
+            log_callback(line.rstrip("\n"))
+        else:
+            print(line, end="")
+
     def _reader():
         try:
             if proc.stdout is None:
                 return
             for line in proc.stdout:
-                if enqueue:
-                    enqueue(line)
-                if log_callback:
-                    log_callback(line.rstrip("\n"))
-                else:
-                    print(line, end="")
+                _emit(line)
         except Exception as e:
             if enqueue:
                 enqueue(f"\n[output reader error] {e}\n")
 
-    t = threading.Thread(target=_reader, daemon=True)
-    t.start()
+    # POSIX: wait on the pipe with a selector in this thread, reading the raw
+    # fd (the TextIOWrapper is never read from, so its buffer stays empty).
+    # Windows can only select() on sockets, so it keeps the reader thread.
+    sel = None
+    t = None
+    if proc.stdout is not None and os.name != "nt":
+        out_fd = proc.stdout.fileno()
+        sel = selectors.DefaultSelector()
+        sel.register(out_fd, selectors.EVENT_READ)
+        decoder = codecs.getincrementaldecoder(proc.stdout.encoding)(errors="replace")
+        pending = ""
+
+        def _emit_text(text: str, final: bool = False) -> str:
+            """Emit complete lines (universal newlines); return the unfinished tail."""
+            keep = ""
+            if not final and text.endswith("\r"):
+                text, keep = text[:-1], "\r"  # may be the first half of \r\n
+            *lines, tail = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            for line in lines:
+                _emit(line + "\n")
+            if final and tail:
+                _emit(tail)
+                tail = ""
+            return tail + keep
+    else:
+        t = threading.Thread(target=_reader, daemon=True)
+        t.start()
 
     # Re-prompt every timeout_s seconds.
     deadline = time.monotonic() + max(1, timeout_s)
@@ -291,7 +359,8 @@ def run_command_verbose(
     try:
         while True:
             # In CLI popup mode, we don't have mainloop(); pump Tk events.
-            if _TK_ROOT is not None and threading.current_thread() is threading.main_thread():
+            pump_tk = _TK_ROOT is not None and threading.current_thread() is threading.main_thread()
+            if pump_tk:
                 try:
                     _TK_ROOT.update_idletasks()
                     _TK_ROOT.update()
@@ -302,7 +371,32 @@ def run_command_verbose(
                 terminated_by_user = True
                 break
 
-            rc = proc.poll()
+            if sel is not None and sel.get_map():
+                # Block until output arrives. Keep the wait short while a
+                # popup (Terminate button / Tk events) needs servicing.
+                wait_s = 0.15 if (pump_tk or enqueue) else min(
+                    1.0, max(0.0, deadline - time.monotonic()))
+                if sel.select(timeout=wait_s):
+                    try:
+                        chunk = os.read(out_fd, 65536)
+                    except OSError:
+                        chunk = b""
+                    if chunk:
+                        pending = _emit_text(pending + decoder.decode(chunk))
+                    else:
+                        sel.unregister(out_fd)
+                        _emit_text(pending + decoder.decode(b"", final=True), final=True)
+                        pending = ""
+                # Don't report the exit code until all output is drained
+                rc = proc.poll() if not sel.get_map() else None
+            elif sel is not None:
+                # Output closed: block on the process itself
+                try:
+                    rc = proc.wait(timeout=0.15)
+                except subprocess.TimeoutExpired:
+                    rc = None
+            else:
+                rc = proc.poll()
             if rc is not None:
                 return rc
 
@@ -318,29 +412,40 @@ def run_command_verbose(
                     break
                 deadline = time.monotonic() + max(1, timeout_s)
 
-            time.sleep(0.15)
+            # Pace the reader-thread path on the stop event, so Terminate
+            # wakes the loop immediately instead of after a fixed sleep.
+            if sel is None and stop_event.wait(timeout=0.15):
+                terminated_by_user = True
+                break
     finally:
         if terminated_by_user and proc.poll() is None:
             try:
                 proc.terminate()
-                try:
-                    proc.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                # Up to 2 s to exit (checked every 50 ms), then kill
+                kill_at = time.monotonic() + 2.0
+                while proc.poll() is None and time.monotonic() < kill_at:
+                    time.sleep(0.05)
+                if proc.poll() is None:
                     proc.kill()
             except Exception:
                 pass
 
+        if sel is not None:
+            sel.close()
+
         try:
             if proc.stdout is not None:
                 proc.stdout.close()
         except Exception:
             pass
 
-        t.join(timeout=1.0)
+        if t is not None:
+            t.join(timeout=1.0)
         if close_popup:
             close_popup()
 
-    return proc.poll() if proc.poll() is not None else 1
+    rc = proc.poll()
+    return rc if rc is not None else 1
 
 
 # ─── Tool Discovery ─────────────────────────────────────────────────
@@ -352,8 +457,53 @@ def get_platformio_core_dir() -> Path:
         return Path(env_dir)
     return Path.home() / ".platformio"
 
+@functools.lru_cache(maxsize=1)
+def _path_index() -> list[tuple[str, dict[str, str]]]:
+    """List each PATH directory once with os.scandir, in search order.
+
+    Returns [(directory, {name: full path}), ...]. Kept per directory so a
+    lookup tries every candidate name in one directory before the next, as
+    shutil.which does. On Windows names are lowercased (lookups are
+    case-insensitive) and the current directory is searched first.
+    """
+    fold = os.name == "nt"
+    dirs = os.environ.get("PATH", "").split(os.pathsep)
+    if fold:
+        dirs.insert(0, os.curdir)
+    index: list[tuple[str, dict[str, str]]] = []
+    seen: set[str] = set()
+    for directory in dirs:
+        if not directory or directory in seen:
+            continue
+        seen.add(directory)
+        try:
+            with os.scandir(directory) as it:
+                names = {(e.name.lower() if fold else e.name): e.path for e in it}
+        except OSError:
+            continue
+        index.append((directory, names))
+    return index
+
+
+def _which(name: str) -> str | None:
+    """shutil.which() backed by the cached PATH index; falls back on a miss."""
+    if os.name == "nt":
+        exts = os.environ.get("PATHEXT", ".COM;.EXE;.BAT;.CMD").split(os.pathsep)
+        candidates = [(name + ext).lower() for ext in exts if ext]
+    else:
+        candidates = [name]
+    for _directory, names in _path_index():
+        for candidate in candidates:
+            path = names.get(candidate)
+            if path and os.path.isfile(path) and os.access(path, os.X_OK):
+                return path
+    import shutil
+    return shutil.which(name)
+
+
+@functools.lru_cache(maxsize=None)
 def find_platformio_cli() -> str | None:
-    """Auto-discover PlatformIO CLI executable.
+    """Auto-discover PlatformIO CLI executable (memoized; cache_clear() after installs).
 
     Search order:
       1. PATH (pio / platformio)
@@ -362,7 +512,7 @@ def find_platformio_cli() -> str | None:
       4. Project-local tools/.venv           (build_firmware.bat venv)
     """
     # 1. System PATH
-    pio_path = shutil.which("pio") or shutil.which("platformio")
+    pio_path = _which("pio") or _which("platformio")
     if pio_path:
         return pio_path
 
@@ -401,9 +551,10 @@ def find_platformio_cli() -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def find_flutter_cli() -> str | None:
-    """Auto-discover Flutter CLI executable."""
-    flutter_path = shutil.which("flutter")
+    """Auto-discover Flutter CLI executable (memoized)."""
+    flutter_path = _which("flutter")
     if flutter_path:
         return flutter_path
 
@@ -443,8 +594,86 @@ def find_flutter_cli() -> str | None:
     return None
 
 
+def find_boot_app0() -> Path | None:
+    """Locate boot_app0.bin in the build dir or the PlatformIO packages.
+
+    The packages lookup is memoized per process (keyed on the packages dir
+    mtime, which changes when a package is installed) and persisted to
+    BOOT_APP0_CACHE so later builds skip the recursive scan.
+    """
+    build_copy = PIO_BUILD_DIR / "boot_app0.bin"
+    if build_copy.is_file():
+        return build_copy
+
+    pkg_base = get_platformio_core_dir() / "packages"
+    try:
+        pkg_mtime = pkg_base.stat().st_mtime_ns
+    except OSError:
+        return None
+    return _find_packaged_boot_app0(str(pkg_base), pkg_mtime)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_packaged_boot_app0(pkg_base_str: str, pkg_mtime: int) -> Path | None:
+    pkg_base = Path(pkg_base_str)
+
+    # Persisted result from a previous run, unless packages changed since
+    try:
+        cached = json.loads(BOOT_APP0_CACHE.read_text(encoding="utf-8"))
+        if (cached.get("packages") == pkg_base_str
+                and cached.get("pkg_mtime") == pkg_mtime
+                and Path(cached["path"]).is_file()):
+            return Path(cached["path"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    boot_app0 = None
+    candidates = [
+        pkg_base / "framework-arduinoespressif32" / "tools" / "partitions" / "boot_app0.bin",
+        pkg_base / "framework-arduinoespressif32" / "tools" / "boot_app0.bin",
+        pkg_base / "tool-esptoolpy" / "boot_app0.bin",
+    ]
+
+    for candidate in candidates:
+        if candidate.is_file():
+            boot_app0 = candidate
+            break
+
+    if not boot_app0:
+        # Only walk ESP32 packages, not every installed toolchain/framework
+        for pkg in pkg_base.iterdir():
+            name = pkg.name.lower()
+            if not pkg.is_dir() or not ("esp32" in name or "espressif32" in name):
+                continue
+            boot_app0 = next(pkg.rglob("boot_app0.bin"), None)
+            if boot_app0:
+                break
+
+    if boot_app0:
+        try:
+            BOOT_APP0_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            BOOT_APP0_CACHE.write_text(
+                json.dumps({"packages": pkg_base_str, "pkg_mtime": pkg_mtime,
+                            "path": str(boot_app0)}),
+                encoding="utf-8")
+        except OSError:
+            pass
+    return boot_app0
+
+
 # ─── Version Helpers ─────────────────────────────────────────────────
 
+# Precompiled patterns for config.h / pubspec.yaml / changelog parsing
+_RE_FW_STRING = re.compile(r'#define\s+FIRMWARE_VERSION_STRING\s+"([^"]+)"')
+_RE_FW_MAJOR = re.compile(r'#define\s+FIRMWARE_VERSION_MAJOR\s+\d+')
+_RE_FW_MINOR = re.compile(r'#define\s+FIRMWARE_VERSION_MINOR\s+\d+')
+_RE_FW_PATCH = re.compile(r'#define\s+FIRMWARE_VERSION_PATCH\s+\d+')
+_RE_APP_VERSION = re.compile(r'^version:\s*(\d+\.\d+\.\d+)', re.MULTILINE)
+_RE_APP_BUILD = re.compile(r'^version:\s*\d+\.\d+\.\d+\+(\d+)', re.MULTILINE)
+_RE_APP_VERSION_LINE = re.compile(r'^version:\s*\d+\.\d+\.\d+\+?\d*', re.MULTILINE)
+_RE_CHANGELOG_TYPE = re.compile(r'^\[(\w+)\]\s*(.*)')
+_RE_SEMVER = re.compile(r'^\d+\.\d+\.\d+\Z')
+
 
 # ─── Environment Preparation ────────────────────────────────────────
 
@@ -530,6 +759,7 @@ def prepare_environment(log_callback=None) -> bool:
             log(f"PlatformIO already in venv: {pio_exe}")
 
         # ── 4. Verify ──
+        find_platformio_cli.cache_clear()  # the negative result is stale now
         pio = find_platformio_cli()
         if pio:
             log(f"PlatformIO ready: {pio}")
@@ -548,27 +778,54 @@ def prepare_environment(log_callback=None) -> bool:
 
     log("")
     log("Environment ready!")
-    log(f"  PlatformIO: {find_platformio_cli()}")
-    log(f"  Flutter:    {find_flutter_cli() or 'not installed'}")
+    log(f"  PlatformIO: {pio}")
+    log(f"  Flutter:    {flutter or 'not installed'}")
     return True
 
 
-def read_firmware_version() -> str:
-    """Read FIRMWARE_VERSION_STRING from include/config.h"""
-    if not CONFIG_H.exists():
+# path -> (mtime_ns, size, version) for the version-file readers
+_VERSION_CACHE: dict[Path, tuple[int, int, str]] = {}
+
+
+def _read_version_file(path: Path, parse) -> str:
+    """Return parse(file content), re-reading only when the file changed."""
+    try:
+        st = path.stat()
+    except OSError:
         return "0.0.0"
-    content = CONFIG_H.read_text(encoding="utf-8")
-    match = re.search(r'#define\s+FIRMWARE_VERSION_STRING\s+"([^"]+)"', content)
+    cached = _VERSION_CACHE.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    version = parse(path.read_text(encoding="utf-8"))
+    _VERSION_CACHE[path] = (st.st_mtime_ns, st.st_size, version)
+    return version
+
+
+def _store_version_file(path: Path, content: str, parse):
+    """Write a version file and seed the cache, so the next read is free."""
+    path.write_text(content, encoding="utf-8")
+    st = path.stat()
+    _VERSION_CACHE[path] = (st.st_mtime_ns, st.st_size, parse(content))
+
+
+def _parse_firmware_version(content: str) -> str:
+    match = _RE_FW_STRING.search(content)
     return match.group(1) if match else "0.0.0"
 
 
+def _parse_app_version(content: str) -> str:
+    match = _RE_APP_VERSION.search(content)
+    return match.group(1) if match else "0.0.0"
+
+
+def read_firmware_version() -> str:
+    """Read FIRMWARE_VERSION_STRING from include/config.h"""
+    return _read_version_file(CONFIG_H, _parse_firmware_version)
+
+
 def read_app_version() -> str:
     """Read version from mobile_app/pubspec.yaml"""
-    if not PUBSPEC_YAML.exists():
-        return "0.0.0"
-    content = PUBSPEC_YAML.read_text(encoding="utf-8")
-    match = re.search(r'^version:\s*(\d+\.\d+\.\d+)', content, re.MULTILINE)
-    return match.group(1) if match else "0.0.0"
+    return _read_version_file(PUBSPEC_YAML, _parse_app_version)
 
 
 def bump_version(version: str, bump_type: str) -> str:
@@ -595,50 +852,75 @@ def write_firmware_version(new_version: str):
     parts = new_version.split(".")
     major, minor, patch = parts[0], parts[1], parts[2]
     content = CONFIG_H.read_text(encoding="utf-8")
-    content = re.sub(
-        r'#define\s+FIRMWARE_VERSION_MAJOR\s+\d+',
-        f'#define FIRMWARE_VERSION_MAJOR {major}', content)
-    content = re.sub(
-        r'#define\s+FIRMWARE_VERSION_MINOR\s+\d+',
-        f'#define FIRMWARE_VERSION_MINOR {minor}', content)
-    content = re.sub(
-        r'#define\s+FIRMWARE_VERSION_PATCH\s+\d+',
-        f'#define FIRMWARE_VERSION_PATCH {patch}', content)
-    content = re.sub(
-        r'#define\s+FIRMWARE_VERSION_STRING\s+"[^"]+"',
+    content = _RE_FW_MAJOR.sub(f'#define FIRMWARE_VERSION_MAJOR {major}', content)
+    content = _RE_FW_MINOR.sub(f'#define FIRMWARE_VERSION_MINOR {minor}', content)
+    content = _RE_FW_PATCH.sub(f'#define FIRMWARE_VERSION_PATCH {patch}', content)
+    content = _RE_FW_STRING.sub(
         f'#define FIRMWARE_VERSION_STRING "{new_version}"', content)
-    CONFIG_H.write_text(content, encoding="utf-8")
+    _store_version_file(CONFIG_H, content, _parse_firmware_version)
 
 
 def write_app_version(new_version: str):
     """Update version in pubspec.yaml"""
     content = PUBSPEC_YAML.read_text(encoding="utf-8")
     # Keep or increment the build number
-    match = re.search(r'^version:\s*\d+\.\d+\.\d+\+(\d+)', content, re.MULTILINE)
+    match = _RE_APP_BUILD.search(content)
     build_num = int(match.group(1)) + 1 if match else 1
-    content = re.sub(
-        r'^version:\s*\d+\.\d+\.\d+\+?\d*',
-        f'version: {new_version}+{build_num}',
-        content, flags=re.MULTILINE)
-    PUBSPEC_YAML.write_text(content, encoding="utf-8")
+    content = _RE_APP_VERSION_LINE.sub(f'version: {new_version}+{build_num}', content)
+    _store_version_file(PUBSPEC_YAML, content, _parse_app_version)
+
+
+# ─── Checksums ───────────────────────────────────────────────────────
+
+# Try to import BLAKE3 (optional — only needed for --hash=blake3)
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+# Buffer size for copy_and_hash on multi-MB artifacts (firmware / APK)
+HASH_CHUNK_SIZE = 1 << 20
+
+# Publish-side integrity sidecar written next to every .md5 (--hash=ALGO,
+# --hash=none to skip). SHA-256 runs on the SHA extensions through OpenSSL,
+# so it is no slower than MD5. The .md5 sidecars always stay: the app's OTA
+# updater downloads them and the firmware verifies the image against that MD5.
+EXTRA_HASH_ALGO: str | None = "sha256"
 
 
-# ─── MD5 ─────────────────────────────────────────────────────────────
+def checksum_algos() -> list[str]:
+    """Algorithms to write sidecars for: always MD5, plus EXTRA_HASH_ALGO."""
+    return ["md5", EXTRA_HASH_ALGO] if EXTRA_HASH_ALGO else ["md5"]
 
-def compute_md5(file_path: Path) -> str:
-    """Compute MD5 hash of a file."""
-    h = hashlib.md5()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+
+def new_hasher(algo: str):
+    """Create a hashlib-style hasher for `algo` (hashlib name or 'blake3')."""
+    if algo == "blake3":
+        if blake3 is None:
+            raise RuntimeError("blake3 is required for --hash=blake3: pip install blake3")
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new(algo)
+
+
+def write_sidecar(path: Path, algo: str, digest: str):
+    """Write `<path>.<algo>` containing the hex digest."""
+    (path.parent / f"{path.name}.{algo}").write_text(digest, encoding="utf-8")
 
 
 # ─── Changelog ───────────────────────────────────────────────────────
 
+# Try to import orjson (optional — falls back to the stdlib json module)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def load_changelog() -> dict:
     """Load existing changelog.json or create empty structure."""
     if CHANGELOG_FILE.exists():
+        if orjson is not None:
+            return orjson.loads(CHANGELOG_FILE.read_bytes())
         with open(CHANGELOG_FILE, "r", encoding="utf-8") as f:
             return json.load(f)
     return {"firmware": [], "app": []}
@@ -647,16 +929,29 @@ def load_changelog() -> dict:
 def save_changelog(data: dict):
     """Save changelog.json."""
     RELEASES_DIR.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        # Same layout as json.dump(indent=2, ensure_ascii=False): UTF-8, 2-space indent
+        CHANGELOG_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(CHANGELOG_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 
+# Serializes load/modify/save when firmware and app release concurrently
+_CHANGELOG_LOCK = threading.Lock()
+
+
 def add_changelog_entry(
     section: str,  # "firmware" or "app"
     version: str,
     changes_text: str,
 ):
     """Add an entry to the changelog.json."""
+    with _CHANGELOG_LOCK:
+        _add_changelog_entry(section, version, changes_text)
+
+
+def _add_changelog_entry(section: str, version: str, changes_text: str):
     data = load_changelog()
 
     changes = []
@@ -664,7 +959,7 @@ def add_changelog_entry(
         line = line.strip()
         if not line:
             continue
-        type_match = re.match(r'^\[(\w+)\]\s*(.*)', line)
+        type_match = _RE_CHANGELOG_TYPE.match(line)
         if type_match:
             change_type = type_match.group(1).lower()
             text = type_match.group(2)
@@ -731,12 +1026,51 @@ def build_firmware(log_callback=None) -> Path | None:
         return None
 
 
-def create_merged_binary(log_callback=None) -> Path | None:
+def _safe_stat(path: Path) -> os.stat_result | None:
+    """Stat `path`, or return None if it doesn't exist."""
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _load_merged_cache(key: str, merged_path: Path) -> dict[str, str] | None:
+    """Digests of merged_path if it is still the image built from `key`."""
+    try:
+        cached = json.loads(MERGED_CACHE.read_text(encoding="utf-8"))
+        st = merged_path.stat()
+        if (cached["key"] != key or cached["size"] != st.st_size
+                or cached["mtime_ns"] != st.st_mtime_ns):
+            return None
+        return {algo: cached["digests"][algo] for algo in checksum_algos()}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_merged_cache(key: str, merged_path: Path, digests: dict[str, str]):
+    try:
+        st = merged_path.stat()
+        MERGED_CACHE.write_text(
+            json.dumps({"key": key, "size": st.st_size,
+                        "mtime_ns": st.st_mtime_ns, "digests": digests}),
+            encoding="utf-8")
+    except OSError:
+        pass
+
+
+def create_merged_binary(log_callback=None) -> tuple[Path, dict[str, str]] | None:
     """Create a merged/full binary ready for complete flash or OTA web tool.
 
     Merges bootloader.bin + partitions.bin + boot_app0.bin + firmware.bin
     at their correct flash offsets into a single file.
 
+    Returns (merged_path, {algo: hexdigest}) for every checksum_algos()
+    entry — hashed from the parts just written so callers need not re-read it.
+
+    The image is content-addressed: if the component bytes and offsets
+    match the last merge (MERGED_CACHE) and firmware-full.bin is untouched,
+    the existing file and its digests are reused without rewriting.
+
     This binary can be flashed with:
       esptool.py write_flash 0x0 firmware-full.bin
     """
@@ -752,35 +1086,13 @@ def create_merged_binary(log_callback=None) -> Path | None:
     firmware   = PIO_BUILD_DIR / "firmware.bin"
 
     # boot_app0.bin is in the framework packages or build dir
-    boot_app0 = None
-    pio_core = get_platformio_core_dir()
-    pkg_base = pio_core / "packages"
-    candidates = [
-        PIO_BUILD_DIR / "boot_app0.bin",
-        pkg_base / "framework-arduinoespressif32" / "tools" / "partitions" / "boot_app0.bin",
-        pkg_base / "framework-arduinoespressif32" / "tools" / "boot_app0.bin",
-        pkg_base / "tool-esptoolpy" / "boot_app0.bin",
-    ]
+    boot_app0 = find_boot_app0()
 
-    for candidate in candidates:
-        if candidate.is_file():
-            boot_app0 = candidate
-            break
-
-    if not boot_app0 and pkg_base.is_dir():
-        for candidate in pkg_base.rglob("boot_app0.bin"):
-            if "esp32" in str(candidate).lower():
-                boot_app0 = candidate
-                break
-
-    # Check all required files exist
-    missing = []
-    if not bootloader.exists():
-        missing.append("bootloader.bin")
-    if not partitions.exists():
-        missing.append("partitions.bin")
-    if not firmware.exists():
-        missing.append("firmware.bin")
+    # Check all required files exist (one stat each, reused for sizes below)
+    b_st, p_st, f_st = map(_safe_stat, (bootloader, partitions, firmware))
+    missing = [name for name, st in (("bootloader.bin", b_st),
+                                     ("partitions.bin", p_st),
+                                     ("firmware.bin", f_st)) if st is None]
 
     if missing:
         log(f"ERROR: Missing build artifacts: {', '.join(missing)}")
@@ -798,32 +1110,50 @@ def create_merged_binary(log_callback=None) -> Path | None:
         0x10000: firmware,
     }
 
-    if boot_app0 and boot_app0.exists():
+    if boot_app0:
         offsets[0xE000] = boot_app0
         log(f"  boot_app0.bin: {boot_app0}")
     else:
         log("  WARNING: boot_app0.bin not found — merged binary may not support OTA boot switching")
 
-    # Calculate total size (from start to end of firmware)
     sorted_offsets = sorted(offsets.items())
-    last_offset, last_file = sorted_offsets[-1]
-    total_size = last_offset + last_file.stat().st_size
-
-    # Create merged binary (fill gaps with 0xFF — flash erased state)
-    merged = bytearray(b'\xFF' * total_size)
 
+    # Lay the image out as [0xFF gap, component, ...] in offset order. Only
+    # the gaps are filled (flash erased state), each component is read once,
+    # and writelines() sends the parts without joining them into one buffer.
+    parts: list[bytes] = []
+    pos = 0
+    key_hash = hashlib.sha256()
     for offset, filepath in sorted_offsets:
+        if offset < pos:
+            log(f"ERROR: {filepath.name} @0x{offset:05X} overlaps the previous image")
+            return None
         data = filepath.read_bytes()
-        merged[offset:offset + len(data)] = data
+        parts += (b"\xFF" * (offset - pos), data)
+        pos = offset + len(data)
+        key_hash.update(offset.to_bytes(4, "little"))
+        key_hash.update(data)
         log(f"  @0x{offset:05X}: {filepath.name} ({len(data)} bytes)")
 
-    # Write merged binary
     merged_path = PIO_BUILD_DIR / "firmware-full.bin"
-    merged_path.write_bytes(bytes(merged))
-
-    size_kb = len(merged) / 1024
+    key = key_hash.hexdigest()
+    digests = _load_merged_cache(key, merged_path)
+    if digests is not None:
+        log(f"Merged binary: {merged_path.name} unchanged ({pos / 1024:.1f} KB)")
+        return merged_path, digests
+    with open(merged_path, "wb") as out:
+        out.writelines(parts)
+
+    hashers = {algo: new_hasher(algo) for algo in checksum_algos()}
+    for part in parts:
+        for h in hashers.values():
+            h.update(part)
+    digests = {algo: h.hexdigest() for algo, h in hashers.items()}
+    _store_merged_cache(key, merged_path, digests)
+
+    size_kb = pos / 1024
     log(f"Merged binary: {merged_path.name} ({size_kb:.1f} KB)")
-    return merged_path
+    return merged_path, digests
 
 
 def build_apk(log_callback=None) -> Path | None:
@@ -908,9 +1238,64 @@ def build_apk(log_callback=None) -> Path | None:
 
 # ─── Package Release ─────────────────────────────────────────────────
 
+def copy_artifact(src: Path, dst: Path) -> int:
+    """Copy a build artifact's data (like shutil.copyfile); returns its size.
+
+    On Linux the data moves via os.copy_file_range, which stays in the
+    kernel and becomes a reflink on Btrfs/XFS; elsewhere (or if the kernel
+    refuses) shutil.copyfile's own fast path is used (fcopyfile on macOS,
+    CopyFile2 on Windows).
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+            copied = remaining == 0
+        except OSError:
+            copied = False
+    if copied:
+        return size
+    import shutil
+    shutil.copyfile(src, dst)
+    return os.path.getsize(dst)
+
+
+def copy_and_hash(src: Path, dst: Path) -> tuple[dict[str, str], int]:
+    """Copy src to dst and hash it in the same pass.
+
+    The source is read once into a reused buffer that feeds both the
+    write and every checksum_algos() hasher, so the artifact is not read
+    back from disk for its sidecars. Source times and permissions are not
+    carried over; release artifacts are stamped when they are published.
+    Returns ({algo: hexdigest}, bytes copied).
+    """
+    hashers = {algo: new_hasher(algo) for algo in checksum_algos()}
+    updates = [h.update for h in hashers.values()]
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    size = 0
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        write = fdst.write
+        while n := fsrc.readinto(buf):
+            size += n
+            chunk = view[:n]
+            while chunk:
+                chunk = chunk[write(chunk):]
+            chunk = view[:n]
+            for update in updates:
+                update(chunk)
+    return {algo: h.hexdigest() for algo, h in hashers.items()}, size
+
+
 def package_firmware_release(version: str, bin_path: Path, log_callback=None,
                              test_build: bool = False) -> bool:
-    """Copy firmware .bin to releases/firmware/ with proper naming and MD5."""
+    """Copy firmware .bin to releases/firmware/ with proper naming and checksums."""
     def log(msg):
         if log_callback:
             log_callback(msg)
@@ -921,34 +1306,42 @@ def package_firmware_release(version: str, bin_path: Path, log_callback=None,
     suffix = "-TEST" if test_build else ""
     dest_name = f"evilcrow-v2-fw-v{version}{suffix}-OTA.bin"
     dest_path = FW_RELEASES_DIR / dest_name
-    md5_path = FW_RELEASES_DIR / f"{dest_name}.md5"
 
-    shutil.copy2(bin_path, dest_path)
-    md5_hash = compute_md5(dest_path)
-    md5_path.write_text(md5_hash, encoding="utf-8")
+    from concurrent.futures import ThreadPoolExecutor
+
+    # The OTA copy+hash and the merged image are independent; overlap them
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        ota_job = pool.submit(copy_and_hash, bin_path, dest_path)
+
+        # Also create merged/full binary for complete flash
+        log("Creating merged OTA-ready binary...")
+        merged = create_merged_binary(log_callback=log)
+        digests, size = ota_job.result()
 
-    size_kb = dest_path.stat().st_size / 1024
-    log(f"Firmware: {dest_path.name} ({size_kb:.1f} KB)")
-    log(f"MD5:      {md5_hash}")
+    for algo, digest in digests.items():
+        write_sidecar(dest_path, algo, digest)
 
-    # Also create merged/full binary for complete flash
-    log("Creating merged OTA-ready binary...")
-    merged = create_merged_binary(log_callback=log)
+    log(f"Firmware: {dest_path.name} ({size / 1024:.1f} KB)")
     if merged:
+        merged_path, full_digests = merged
         full_name = f"evilcrow-v2-fw-v{version}{suffix}-full.bin"
         full_dest = FW_RELEASES_DIR / full_name
-        full_md5_path = FW_RELEASES_DIR / f"{full_name}.md5"
-        shutil.copy2(merged, full_dest)
-        full_md5 = compute_md5(full_dest)
-        full_md5_path.write_text(full_md5, encoding="utf-8")
-        log(f"Full:     {full_dest.name} ({full_dest.stat().st_size / 1024:.1f} KB)")
+        full_size = copy_artifact(merged_path, full_dest)
+        # Already hashed in memory while merging — no re-read needed
+        for algo, digest in full_digests.items():
+            write_sidecar(full_dest, algo, digest)
+
+    for algo, digest in digests.items():
+        log(f"{algo.upper() + ':':<10}{digest}")
+    if merged:
+        log(f"Full:     {full_dest.name} ({full_size / 1024:.1f} KB)")
 
     return True
 
 
 def package_app_release(version: str, apk_path: Path, log_callback=None,
                         test_build: bool = False) -> bool:
-    """Copy APK to releases/app/ with proper naming and MD5."""
+    """Copy APK to releases/app/ with proper naming and checksums."""
     def log(msg):
         if log_callback:
             log_callback(msg)
@@ -959,15 +1352,14 @@ def package_app_release(version: str, apk_path: Path, log_callback=None,
     suffix = "-TEST" if test_build else ""
     dest_name = f"EvilCrowRF-v{version}{suffix}.apk"
     dest_path = APP_RELEASES_DIR / dest_name
-    md5_path = APP_RELEASES_DIR / f"{dest_name}.md5"
 
-    shutil.copy2(apk_path, dest_path)
-    md5_hash = compute_md5(dest_path)
-    md5_path.write_text(md5_hash, encoding="utf-8")
+    digests, size = copy_and_hash(apk_path, dest_path)
+    for algo, digest in digests.items():
+        write_sidecar(dest_path, algo, digest)
 
-    size_mb = dest_path.stat().st_size / (1024 * 1024)
-    log(f"APK:  {dest_path.name} ({size_mb:.1f} MB)")
-    log(f"MD5:  {md5_hash}")
+    log(f"APK:    {dest_path.name} ({size / (1024 * 1024):.1f} MB)")
+    for algo, digest in digests.items():
+        log(f"{algo.upper() + ':':<8}{digest}")
     return True
 
 
@@ -975,6 +1367,13 @@ def package_app_release(version: str, apk_path: Path, log_callback=None,
 # CLI Mode
 # =====================================================================
 
+def _prefixed_print(prefix: str):
+    """Return a log callback that prints each message with `prefix`."""
+    def _log(msg: str):
+        print(f"{prefix}{msg}", flush=True)
+    return _log
+
+
 def cli_release_firmware(bump_type: str = "patch", changelog: str = "",
                          log_callback=None, test_build: bool = False,
                          no_bump: bool = False):
@@ -1057,6 +1456,55 @@ def cli_release_apk(bump_type: str = "patch", changelog: str = "",
     return True
 
 
+def cli_release_both(bump_type: str = "patch", changelog: str = "",
+                     test_build: bool = False, no_bump: bool = False):
+    """Release firmware and APK concurrently from CLI.
+
+    The two pipelines are independent, so the network-bound flutter pub
+    get / gradle work overlaps the CPU-bound pio compile. Lines are
+    prefixed per task.
+    """
+    global _TK_CALLS
+    from concurrent.futures import ThreadPoolExecutor, wait
+    # Workers can't create the hidden root themselves; make it here so their
+    # command popups and timeout prompts run on this thread.
+    pump_tk = _ensure_tk_root_for_cli()
+    if pump_tk:
+        _TK_CALLS = queue.Queue()
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            jobs = [
+                pool.submit(cli_release_firmware, bump_type, changelog, test_build=test_build,
+                            no_bump=no_bump, log_callback=_prefixed_print("[fw]  ")),
+                pool.submit(cli_release_apk, bump_type, changelog, test_build=test_build,
+                            no_bump=no_bump, log_callback=_prefixed_print("[apk] ")),
+            ]
+            # No mainloop() in CLI mode: run the workers' queued Tk calls and
+            # pump events until both jobs finish, plus one last pass for the
+            # popup closes they queued on the way out
+            while pump_tk:
+                finished = not wait(jobs, timeout=0.05).not_done
+                while True:
+                    try:
+                        fn = _TK_CALLS.get_nowait()
+                    except queue.Empty:
+                        break
+                    try:
+                        fn()
+                    except Exception as e:
+                        print(f"Popup error: {e}")
+                try:
+                    _TK_ROOT.update_idletasks()
+                    _TK_ROOT.update()
+                except Exception:
+                    pass
+                if finished:
+                    break
+    finally:
+        _TK_CALLS = None
+    return all([job.result() for job in jobs])
+
+
 def cli_interactive():
     """Interactive CLI mode when --cli is passed."""
     print("=" * 50)
@@ -1092,8 +1540,7 @@ def cli_interactive():
     elif choice == "3":
         bump = input("Bump type [major/minor/patch] (default: patch): ").strip() or "patch"
         cl = input("Changelog (one line, or empty): ").strip()
-        cli_release_firmware(bump, cl)
-        cli_release_apk(bump, cl)
+        cli_release_both(bump, cl)
     elif choice == "4":
         build_firmware()
     elif choice == "5":
@@ -1299,17 +1746,35 @@ def launch_gui():
         relief=tk.FLAT, wrap=tk.WORD, state=tk.DISABLED)
     log_text.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
 
+    # Build output arrives line by line from worker threads; buffer it
+    # (bounded, like the command popup) and flush one insert per tick.
+    log_pending: collections.deque[str] = collections.deque(maxlen=POPUP_QUEUE_MAX)
+    log_lock = threading.Lock()
+    log_flush_scheduled = False
+
+    def _flush_log():
+        nonlocal log_flush_scheduled
+        with log_lock:
+            lines = list(log_pending)
+            log_pending.clear()
+            log_flush_scheduled = False
+        log_text.config(state=tk.NORMAL)
+        log_text.insert(tk.END, "\n".join(lines) + "\n")
+        log_text.see(tk.END)
+        log_text.config(state=tk.DISABLED)
+
     def log(msg: str):
-        def _append():
-            log_text.config(state=tk.NORMAL)
-            log_text.insert(tk.END, msg + "\n")
-            log_text.see(tk.END)
-            log_text.config(state=tk.DISABLED)
-        root.after(0, _append)
+        nonlocal log_flush_scheduled
+        with log_lock:
+            log_pending.append(msg)
+            if log_flush_scheduled:
+                return
+            log_flush_scheduled = True
+        root.after(50, _flush_log)
 
     # ── Release logic ──
 
-    def _release_firmware():
+    def _release_firmware(log=log):
         is_test = fw_test_var.get()
         is_nobump = fw_nobump_var.get()
         version = fw_new_ver.get().strip()
@@ -1320,7 +1785,7 @@ def launch_gui():
             label = "TEST BUILD" if is_test else "Release (no version bump)"
             log(f"=== Firmware {label} v{version} ===")
         else:
-            if not re.match(r'^\d+\.\d+\.\d+$', version):
+            if not _RE_SEMVER.match(version):
                 log("ERROR: Invalid firmware version format. Use X.Y.Z")
                 return
             log(f"=== Firmware Release v{version} ===")
@@ -1364,7 +1829,7 @@ def launch_gui():
             log(f"  Git tag: git tag fw-v{version} && git push origin fw-v{version}")
         log("")
 
-    def _release_app():
+    def _release_app(log=log):
         is_test = app_test_var.get()
         is_nobump = app_nobump_var.get()
         version = app_new_ver.get().strip()
@@ -1374,7 +1839,7 @@ def launch_gui():
             label = "TEST BUILD" if is_test else "Release (no version bump)"
             log(f"=== App {label} v{version} ===")
         else:
-            if not re.match(r'^\d+\.\d+\.\d+$', version):
+            if not _RE_SEMVER.match(version):
                 log("ERROR: Invalid app version format. Use X.Y.Z")
                 return
             log(f"=== App Release v{version} ===")
@@ -1413,8 +1878,16 @@ def launch_gui():
         log("")
 
     def _release_both():
-        _release_firmware()
-        _release_app()
+        # Independent pipelines — run them side by side. log() only
+        # schedules root.after callbacks, so it is safe from both workers.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            jobs = [
+                pool.submit(_release_firmware, lambda msg: log(f"[fw]  {msg}")),
+                pool.submit(_release_app, lambda msg: log(f"[apk] {msg}")),
+            ]
+            for job in jobs:
+                job.result()
         log("=== Both releases complete ===")
 
     # Show tool discovery status
@@ -1436,6 +1909,7 @@ def launch_gui():
 # =====================================================================
 
 def main():
+    global EXTRA_HASH_ALGO
     args = sys.argv[1:]
 
     if "--help" in args or "-h" in args:
@@ -1453,11 +1927,33 @@ def main():
     for a in args:
         if a.startswith("--bump="):
             bump = a.split("=", 1)[1]
+        elif a.startswith("--hash="):
+            EXTRA_HASH_ALGO = a.split("=", 1)[1].lower()
+            if EXTRA_HASH_ALGO in ("none", "md5"):
+                EXTRA_HASH_ALGO = None
+
+    if EXTRA_HASH_ALGO:
+        if EXTRA_HASH_ALGO == "blake3" and blake3 is None:
+            print("blake3 not installed (pip install blake3).")
+            sys.exit(1)
+        # Trial digest up front: unknown names raise ValueError, and the
+        # variable-length shake_* algorithms need a length for hexdigest()
+        try:
+            new_hasher(EXTRA_HASH_ALGO).hexdigest()
+        except ValueError:
+            print(f"Unknown hash algorithm: {EXTRA_HASH_ALGO}")
+            sys.exit(1)
+        except TypeError:
+            print(f"Variable-length hash algorithm not supported: {EXTRA_HASH_ALGO}")
+            sys.exit(1)
 
     if is_prepare:
         prepare_environment()
     elif is_cli:
         cli_interactive()
+    elif build_fw and build_app:
+        # Direct CLI build (non-interactive), both pipelines in parallel
+        cli_release_both(bump, test_build=is_test, no_bump=is_nobump)
     elif build_fw or build_app:
         # Direct CLI build (non-interactive)
         if build_fw:
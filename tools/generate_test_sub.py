@@ -10,53 +10,173 @@ Each test file is designed to match EXACTLY what the corresponding
 firmware decoder expects (timing, bit count, preamble structure).
 
 Output files are placed in tools/test_data/
+(--parallel builds them in separate worker processes)
 
 Protocols tested:
   1. KiaV0  — PWM, 61-bit, CRC8 poly 0x7F (te=250/500µs)
   2. Subaru — PWM, 64-bit (te=800/1600µs)
   3. Scher-Khan — PWM, 51-bit Dynamic (te=750/1100µs)
+
+Optional speedups: NumPy (plus Numba for the fill loop), or the Cython
+encoders in pulses_ext.pyx (pip install cython && cythonize -i tools/pulses_ext.pyx).
+sk_viper.py is a standalone @micropython.viper Scher-Khan generator for on-device use.
 """
 
+import functools
+import logging
 import os
+import sys
+from array import array
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "test_data")
 
+# Per-signal details from the generators. Lazily formatted and only shown
+# once _setup_logging() has run (CLI), so library/sweep use stays quiet.
+log = logging.getLogger(__name__)
+
+
+def _setup_logging():
+    """Print generator details to stdout as plain lines."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
 
 # ============================================================================
 # Helpers
 # ============================================================================
 
-def pulses_to_raw_data_lines(pulses: list, max_per_line: int = 512) -> list:
+def pulses_to_raw_data_lines(pulses: array, max_per_line: int = 512) -> list:
     """Convert pulse list to RAW_Data lines for .sub file."""
-    lines = []
-    current = []
-    for p in pulses:
-        current.append(str(p))
-        if len(current) >= max_per_line:
-            lines.append("RAW_Data: " + " ".join(current))
-            current = []
-    if current:
-        lines.append("RAW_Data: " + " ".join(current))
-    return lines
+    # A pulse train only uses a handful of durations: format each one once
+    # and look the strings up, instead of calling str() on every sample.
+    names = {p: str(p) for p in set(pulses)}
+    strs = list(map(names.__getitem__, pulses))
+    return ["RAW_Data: " + " ".join(strs[i:i + max_per_line])
+            for i in range(0, len(strs), max_per_line)]
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use (optional — vectorized PWM pulse building).
+
+    Deferred so the plain `python generate_test_sub.py` run does not pay
+    for the NumPy import; returns None when it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=None)
+def _pwm_fill_jit():
+    """Numba-compiled PWM fill loop, or None (optional — compiled on first use)."""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def fill(bits, lut, out):
+        for k in range(bits.shape[0]):
+            b = bits[k]
+            out[2 * k] = lut[b, 0]
+            out[2 * k + 1] = lut[b, 1]
+
+    return fill
+
+
+def _encode_np(np, data: int, nbits: int, pairs) -> array:
+    """Expand the low `nbits` of `data` (MSB first) through a (bit 0, bit 1) pair table."""
+    nbytes = (nbits + 7) // 8
+    bits = np.unpackbits(np.frombuffer(data.to_bytes(nbytes, "big"), dtype=np.uint8))
+    bits = bits[8 * nbytes - nbits:]
+    lut = np.array(pairs, dtype=np.intc)
+    fill = _pwm_fill_jit()
+    if fill is None:
+        return array("i", lut[bits].tobytes())  # one C-level gather
+    out = np.empty(2 * nbits, dtype=np.intc)
+    fill(bits, lut, out)
+    return array("i", out.tobytes())
+
+
+# Bits of every byte value, MSB first (pure-Python bit unpacking)
+_BYTE_BITS = tuple(tuple((b >> i) & 1 for i in range(7, -1, -1)) for b in range(256))
+
+
+def _bits_msb_first(data: int, nbits: int) -> list:
+    """The low `nbits` of `data` as a list of 0/1, MSB first (no NumPy)."""
+    nbytes = (nbits + 7) // 8
+    bits = [bit for byte in data.to_bytes(nbytes, "big") for bit in _BYTE_BITS[byte]]
+    return bits[8 * nbytes - nbits:]
+
+
+def _encode_py(data: int, nbits: int, pairs) -> array:
+    """Pure-Python counterpart of _encode_np.
+
+    Each pair is pre-packed to its native int32 bytes, so the expansion is
+    one bytes join and a single frombytes — no per-sample int objects.
+    """
+    packed = tuple(array("i", pair).tobytes() for pair in pairs)
+    return array("i", b"".join(map(packed.__getitem__, _bits_msb_first(data, nbits))))
+
+
+def pwm_bit_pulses(data: int, nbits: int, one: int, zero: int, low: int) -> array:
+    """PWM-encode the low `nbits` of `data`, MSB first.
+
+    Each bit becomes a HIGH of `one` or `zero` followed by the `low` separator.
+    """
+    pairs = ((zero, low), (one, low))
+    np = _numpy()
+    if np is not None:
+        return _encode_np(np, data, nbits, pairs)
+    return _encode_py(data, nbits, pairs)
+
+
+def pwm_pair_pulses(data: int, nbits: int, one: int, zero: int) -> array:
+    """PWM-encode the low `nbits` of `data`, MSB first, as symmetric pairs.
+
+    Each bit becomes a HIGH and a LOW of the same width, `one` or `zero`.
+    """
+    pairs = ((zero, -zero), (one, -one))
+    np = _numpy()
+    if np is not None:
+        return _encode_np(np, data, nbits, pairs)
+    return _encode_py(data, nbits, pairs)
+
+
+# Try to import the compiled encoders (optional — cythonize -i tools/pulses_ext.pyx)
+try:
+    from pulses_ext import pwm_bit_pulses, pwm_pair_pulses
+except ImportError:
+    pass
 
 
 def write_sub_file(filepath: str, frequency: int, preset: str,
-                   protocol: str, pulses: list, repeats: int = 3):
+                   protocol: str, pulses: array, repeats: int = 3):
     """Write a Flipper-compatible .sub file."""
-    all_pulses = []
-    for _ in range(repeats):
-        all_pulses.extend(pulses)
+    all_pulses = pulses * repeats
 
     raw_lines = pulses_to_raw_data_lines(all_pulses)
 
-    with open(filepath, "w", newline="\n") as f:
-        f.write("Filetype: Flipper SubGhz RAW File\n")
-        f.write("Version: 1\n")
-        f.write(f"Frequency: {frequency}\n")
-        f.write(f"Preset: {preset}\n")
-        f.write(f"Protocol: {protocol}\n")
-        for line in raw_lines:
-            f.write(line + "\n")
+    content = "\n".join([
+        "Filetype: Flipper SubGhz RAW File",
+        "Version: 1",
+        f"Frequency: {frequency}",
+        f"Preset: {preset}",
+        f"Protocol: {protocol}",
+        *raw_lines,
+        "",
+    ])
+    # Encode once and hand the whole file to the kernel with os.write,
+    # bypassing the text and buffered layers
+    buf = memoryview(content.encode("ascii"))
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        while buf:
+            buf = buf[os.write(fd, buf):]
+    finally:
+        os.close(fd)
 
     total_samples = len(all_pulses)
     print(f"  Written: {filepath}")
@@ -67,9 +187,8 @@ def write_sub_file(filepath: str, frequency: int, preset: str,
 # KIA V0 — PWM, 61 bits, CRC8 poly 0x7F
 # ============================================================================
 
-def kia_v0_crc8(data: int, start_bit: int, end_bit: int) -> int:
-    """CRC8 with polynomial 0x7F (matches PPKiaV0 firmware)."""
-    crc = 0
+def _crc8_bitwise(data: int, start_bit: int, end_bit: int, crc: int = 0) -> int:
+    """Bit-serial CRC8, poly 0x7F, over data bits start_bit..end_bit (MSB first)."""
     for i in range(start_bit, end_bit - 1, -1):
         bit = (data >> i) & 1
         if ((crc >> 7) ^ bit) & 1:
@@ -79,7 +198,49 @@ def kia_v0_crc8(data: int, start_bit: int, end_bit: int) -> int:
     return crc
 
 
-def generate_kia_v0_pulses(counter: int, serial: int, button: int) -> list:
+def _build_crc8_table(poly: int) -> bytes:
+    """256-entry MSB-first CRC8 table: entry b = CRC of byte b from crc 0."""
+    table = bytearray(256)
+    for b in range(256):
+        crc = b
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[b] = crc
+    return bytes(table)
+
+
+_CRC8_7F = _build_crc8_table(0x7F)
+
+
+def kia_v0_crc8(data: int, start_bit: int, end_bit: int) -> int:
+    """CRC8 with polynomial 0x7F (matches PPKiaV0 firmware).
+
+    Whole bytes go through _CRC8_7F (6 lookups for bits 55..8); any
+    leftover low bits fall back to the bit-serial loop.
+    """
+    nbytes = (start_bit - end_bit + 1) // 8
+    crc = 0
+    for shift in range(start_bit - 7, start_bit - 8 * nbytes, -8):
+        crc = _CRC8_7F[crc ^ ((data >> shift) & 0xFF)]
+    return _crc8_bitwise(data, start_bit - 8 * nbytes, end_bit, crc)
+
+
+def _check_crc8_table():
+    """Cross-check kia_v0_crc8 against the bit-serial reference (CLI runs only).
+
+    One range leaves bits over, so the bit-serial fallback is covered too.
+    """
+    for data in (0, (1 << 61) - 1, 0x00AB_CDEF_0123_4500, 0x0123_4567_89AB_CDEF):
+        for start_bit, end_bit in ((55, 8), (60, 0), (31, 3)):
+            if kia_v0_crc8(data, start_bit, end_bit) != _crc8_bitwise(data, start_bit, end_bit):
+                raise RuntimeError("CRC8 table does not match the bit-serial reference")
+
+
+# Preamble (32 x +250 -250) and sync (+500 -500) — the same for every frame
+_KIA_V0_PREAMBLE = array("i", (250, -250) * 32 + (500, -500))
+
+
+def generate_kia_v0_pulses(counter: int, serial: int, button: int) -> array:
     """Generate KiaV0 PWM-encoded pulse durations.
 
     Decoder: PPKiaV0 (te_short=250, te_long=500, te_delta=100, min_count_bit=61)
@@ -110,8 +271,9 @@ def generate_kia_v0_pulses(counter: int, serial: int, button: int) -> list:
     crc = kia_v0_crc8(data, 55, 8)
     data |= crc
 
-    print(f"  KiaV0 data word: 0x{data:016X} ({bin(data)})")
-    print(f"  counter={counter}, serial=0x{serial:07X}, button={button}, crc=0x{crc:02X}")
+    if log.isEnabledFor(logging.INFO):  # bin() isn't a %-format, so skip it when quiet
+        log.info("  KiaV0 data word: 0x%016X (%s)", data, bin(data))
+    log.info("  counter=%d, serial=0x%07X, button=%d, crc=0x%02X", counter, serial, button, crc)
 
     # Verify extraction matches firmware
     assert (data >> 40) & 0xFFFF == counter
@@ -119,29 +281,20 @@ def generate_kia_v0_pulses(counter: int, serial: int, button: int) -> list:
     assert (data >> 8) & 0x0F == button
     assert data & 0xFF == crc
 
-    pulses = []
-
-    # Preamble: 32 short pairs
-    for _ in range(32):
-        pulses.append(TE_SHORT)
-        pulses.append(-TE_SHORT)
+    # Final size is fixed (66 + 122 + 1): fill in place, no growth
+    pulses = array("i", [0]) * 189
 
-    # Sync: long HIGH + long LOW
-    pulses.append(TE_LONG)
-    pulses.append(-TE_LONG)
+    # Preamble: 32 short pairs, then sync: long HIGH + long LOW
+    pulses[0:66] = _KIA_V0_PREAMBLE
 
     # Data bits: 61 bits MSB first (bit 60 down to 0)
-    for bit_pos in range(60, -1, -1):
-        if (data >> bit_pos) & 1:
-            pulses.append(TE_LONG)      # 1 = long HIGH
-        else:
-            pulses.append(TE_SHORT)     # 0 = short HIGH
-        pulses.append(-TE_SHORT)        # separator LOW
+    # 1 = long HIGH, 0 = short HIGH, each followed by a short separator LOW
+    pulses[66:188] = pwm_bit_pulses(data, 61, TE_LONG, TE_SHORT, -TE_SHORT)
 
     # End gap (triggers decoder: LOW > te_long*3 = 1500)
-    pulses.append(-2000)
+    pulses[188] = -2000
 
-    print(f"  Pulse count: {len(pulses)} (preamble=64, sync=2, data=122, gap=1)")
+    log.info("  Pulse count: %d (preamble=64, sync=2, data=122, gap=1)", len(pulses))
     return pulses
 
 
@@ -149,7 +302,11 @@ def generate_kia_v0_pulses(counter: int, serial: int, button: int) -> list:
 # SUBARU — PWM, 64 bits (te_short=800, te_long=1600)
 # ============================================================================
 
-def generate_subaru_pulses(serial_bytes: bytes, button: int, counter_lo: int) -> list:
+# Preamble: 80 x +1600 with -1600 between, last LOW = -4000 sync gap
+_SUBARU_PREAMBLE = array("i", (1600, -1600) * 79 + (1600, -4000))
+
+
+def generate_subaru_pulses(serial_bytes: bytes, button: int, counter_lo: int) -> array:
     """Generate Subaru PWM-encoded pulse durations.
 
     Decoder: PPSubaru (te_short=800, te_long=1600, te_delta=200, min_count_bit=64)
@@ -170,49 +327,41 @@ def generate_subaru_pulses(serial_bytes: bytes, button: int, counter_lo: int) ->
     TE_LONG = 1600
 
     # Build 8 key bytes
-    key_bytes = bytearray(8)
-    key_bytes[0] = serial_bytes[0] & 0xFF
-    key_bytes[1] = serial_bytes[1] & 0xFF
-    key_bytes[2] = serial_bytes[2] & 0xFF
-    key_bytes[3] = 0x12  # Counter-related
-    key_bytes[4] = (counter_lo & 0x0F) << 4  # lo nibble in high nibble of byte 4
-    key_bytes[5] = (button & 0x0F) << 4       # Button in high nibble
-    key_bytes[6] = 0x56
-    key_bytes[7] = counter_lo & 0x0F          # lo nibble to low nibble of byte 7
+    key_bytes = bytes((
+        serial_bytes[0] & 0xFF,
+        serial_bytes[1] & 0xFF,
+        serial_bytes[2] & 0xFF,
+        0x12,                       # Counter-related
+        (counter_lo & 0x0F) << 4,   # lo nibble in high nibble of byte 4
+        (button & 0x0F) << 4,       # Button in high nibble
+        0x56,
+        counter_lo & 0x0F,          # lo nibble to low nibble of byte 7
+    ))
 
     # Convert to 64-bit data word (MSB first)
-    data = 0
-    for b in key_bytes:
-        data = (data << 8) | b
+    data = int.from_bytes(key_bytes, "big")
 
-    print(f"  Subaru data word: 0x{data:016X}")
-    print(f"  serial=0x{serial_bytes[0]:02X}{serial_bytes[1]:02X}{serial_bytes[2]:02X}, "
-          f"button={button}, counter_lo=0x{counter_lo:02X}")
-    print(f"  key_bytes: {' '.join(f'{b:02X}' for b in key_bytes)}")
+    log.info("  Subaru data word: 0x%016X", data)
+    log.info("  serial=0x%02X%02X%02X, button=%d, counter_lo=0x%02X",
+             serial_bytes[0], serial_bytes[1], serial_bytes[2], button, counter_lo)
+    if log.isEnabledFor(logging.INFO):
+        log.info("  key_bytes: %s", key_bytes.hex(" ").upper())
 
-    pulses = []
+    # Final size is fixed (160 + 128 + 2): fill in place, no growth
+    pulses = array("i", [0]) * 290
 
     # Preamble: 80 long HIGH/LOW pairs, last LOW = sync gap (>2500µs)
-    for i in range(80):
-        pulses.append(TE_LONG)
-        if i < 79:
-            pulses.append(-TE_LONG)
-        else:
-            pulses.append(-4000)  # Sync gap
+    pulses[0:160] = _SUBARU_PREAMBLE
 
     # Data bits: 64 bits MSB first
-    for bit_pos in range(63, -1, -1):
-        if (data >> bit_pos) & 1:
-            pulses.append(TE_SHORT)     # short HIGH = 1
-        else:
-            pulses.append(TE_LONG)      # long HIGH = 0
-        pulses.append(-TE_SHORT)        # separator LOW
+    # short HIGH = 1, long HIGH = 0, each followed by a short separator LOW
+    pulses[160:288] = pwm_bit_pulses(data, 64, TE_SHORT, TE_LONG, -TE_SHORT)
 
     # End: short HIGH + long LOW gap (triggers processData)
-    pulses.append(TE_SHORT)
-    pulses.append(-4000)
+    pulses[288] = TE_SHORT
+    pulses[289] = -4000
 
-    print(f"  Pulse count: {len(pulses)} (preamble=160, data=128, end=2)")
+    log.info("  Pulse count: %d (preamble=160, data=128, end=2)", len(pulses))
     return pulses
 
 
@@ -220,7 +369,13 @@ def generate_subaru_pulses(serial_bytes: bytes, button: int, counter_lo: int) ->
 # SCHER-KHAN — PWM, 51-bit Dynamic (te_short=750, te_long=1100)
 # ============================================================================
 
-def generate_scher_khan_pulses(data_50bits: int) -> list:
+# 3 header pairs (+1500 -750, HIGH = te_short * 2) and the start bit (+750 -750)
+_SK_HEADER = array("i", (1500, -750) * 3 + (750, -750))
+# Stop bit (+2000, HIGH >= 1420 triggers extractData) and end gap
+_SK_TAIL = array("i", (2000, -3000))
+
+
+def generate_scher_khan_pulses(data_50bits: int) -> array:
     """Generate Scher-Khan 51-bit Dynamic PWM-encoded pulse durations.
 
     Decoder: PPScherKhan (te_short=750, te_long=1100, te_delta=160, min_count_bit=35)
@@ -239,42 +394,30 @@ def generate_scher_khan_pulses(data_50bits: int) -> list:
     """
     TE_SHORT = 750
     TE_LONG = 1100
-    TE_HEADER = 1500  # te_short * 2
 
-    print(f"  Scher-Khan data (50 bits): 0x{data_50bits:013X}")
+    log.info("  Scher-Khan data (50 bits): 0x%013X", data_50bits)
 
     # Extract fields (mirrors firmware extractData for case 51)
     serial_raw = ((data_50bits >> 24) & 0xFFFFFF0) | ((data_50bits >> 20) & 0x0F)
     btn = (data_50bits >> 24) & 0x0F
     cnt = data_50bits & 0xFFFF
-    print(f"  serial=0x{serial_raw:08X}, button={btn}, counter=0x{cnt:04X}")
-
-    pulses = []
+    log.info("  serial=0x%08X, button=%d, counter=0x%04X", serial_raw, btn, cnt)
 
-    # Preamble: 3 header pairs (double-short HIGH + short LOW)
-    for _ in range(3):
-        pulses.append(TE_HEADER)    # 1500µs HIGH
-        pulses.append(-TE_SHORT)    # 750µs LOW
+    # Final size is fixed (6 + 2 + 100 + 2): fill in place, no growth
+    pulses = array("i", [0]) * 110
 
-    # Start bit (short HIGH + short LOW)
-    pulses.append(TE_SHORT)         # 750µs HIGH
-    pulses.append(-TE_SHORT)        # 750µs LOW
+    # Preamble: 3 header pairs (double-short HIGH + short LOW), then
+    # start bit (short HIGH + short LOW)
+    pulses[0:8] = _SK_HEADER
 
     # Data: 50 bits MSB first
-    for bit_pos in range(49, -1, -1):
-        if (data_50bits >> bit_pos) & 1:
-            pulses.append(TE_LONG)      # 1100µs HIGH = 1
-            pulses.append(-TE_LONG)     # 1100µs LOW = 1
-        else:
-            pulses.append(TE_SHORT)     # 750µs HIGH = 0
-            pulses.append(-TE_SHORT)    # 750µs LOW = 0
+    # 1 = +1100 -1100, 0 = +750 -750
+    pulses[8:108] = pwm_pair_pulses(data_50bits, 50, TE_LONG, TE_SHORT)
 
-    # Stop bit: long HIGH (>= 1420µs) triggers extractData
-    pulses.append(2000)
-    # End gap
-    pulses.append(-3000)
+    # Stop bit: long HIGH (>= 1420µs) triggers extractData, then end gap
+    pulses[108:110] = _SK_TAIL
 
-    print(f"  Pulse count: {len(pulses)} (header=6, start=2, data=100, stop+gap=2)")
+    log.info("  Pulse count: %d (header=6, start=2, data=100, stop+gap=2)", len(pulses))
     return pulses
 
 
@@ -282,58 +425,75 @@ def generate_scher_khan_pulses(data_50bits: int) -> list:
 # Main
 # ============================================================================
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+@functools.lru_cache(maxsize=1024)
+def _cached_pulses(generate, kwargs_items: tuple) -> array:
+    return generate(**dict(kwargs_items))
 
-    # ── Test 1: KiaV0 key fob signal (61-bit PWM + CRC8) ─────────
-    print("\n=== Test 1: KiaV0 (PWM, 61-bit, CRC8) ===")
-    kia_pulses = generate_kia_v0_pulses(
-        counter=1,
-        serial=0x0ABCDEF,
-        button=3
-    )
-    write_sub_file(
-        os.path.join(OUTPUT_DIR, "test_kia_v0.sub"),
-        frequency=433920000,
-        preset="FuriHalSubGhzPresetOok270Async",
-        protocol="RAW",
-        pulses=kia_pulses,
-        repeats=3
-    )
 
-    # ── Test 2: Subaru key fob signal (64-bit PWM) ────────────────
-    print("\n=== Test 2: Subaru (PWM, 64-bit) ===")
-    subaru_pulses = generate_subaru_pulses(
-        serial_bytes=bytes([0xAB, 0xCD, 0xEF]),
-        button=2,   # Unlock
-        counter_lo=0x05
-    )
-    write_sub_file(
-        os.path.join(OUTPUT_DIR, "test_subaru.sub"),
-        frequency=433920000,
-        preset="FuriHalSubGhzPresetOok650Async",
-        protocol="RAW",
-        pulses=subaru_pulses,
-        repeats=3
-    )
+def cached_pulses(generate, **kwargs) -> array:
+    """generate(**kwargs), memoized on its inputs (sweeps, test harnesses).
 
-    # ── Test 3: Scher-Khan Dynamic (51-bit PWM) ──────────────────
-    print("\n=== Test 3: Scher-Khan Dynamic (PWM, 51-bit) ===")
-    # Build a 50-bit test data word
-    # Layout for case 51: serial from upper bits, btn at bits 27..24, cnt at bits 15..0
-    sk_data = (0x5 << 24) | (0xABCD << 8) | 0x1234  # btn=5, some serial data, counter=0x1234
-    # Ensure only 50 bits used
-    sk_data = sk_data & ((1 << 50) - 1)
-    scher_khan_pulses = generate_scher_khan_pulses(sk_data)
+    Returns a fresh copy, so callers may modify it. Details are only
+    logged the first time a given input is generated.
+    """
+    return array("i", _cached_pulses(generate, tuple(sorted(kwargs.items()))))
+
+
+# Scher-Khan 50-bit test data word. Layout for case 51: serial from upper
+# bits, btn at bits 27..24, cnt at bits 15..0 (btn=5, counter=0x1234)
+_SK_TEST_DATA = ((0x5 << 24) | (0xABCD << 8) | 0x1234) & ((1 << 50) - 1)
+
+# Test files: (heading, file name, generator, generator kwargs, preset).
+# All are 433.92 MHz RAW captures with the frame repeated 3 times.
+SPECS = (
+    ("Test 1: KiaV0 (PWM, 61-bit, CRC8)", "test_kia_v0.sub",
+     generate_kia_v0_pulses,
+     dict(counter=1, serial=0x0ABCDEF, button=3),
+     "FuriHalSubGhzPresetOok270Async"),
+    ("Test 2: Subaru (PWM, 64-bit)", "test_subaru.sub",
+     generate_subaru_pulses,
+     dict(serial_bytes=bytes([0xAB, 0xCD, 0xEF]),
+          button=2,   # Unlock
+          counter_lo=0x05),
+     "FuriHalSubGhzPresetOok650Async"),
+    ("Test 3: Scher-Khan Dynamic (PWM, 51-bit)", "test_scher_khan.sub",
+     generate_scher_khan_pulses,
+     dict(data_50bits=_SK_TEST_DATA),
+     "FuriHalSubGhzPresetOok650Async"),
+)
+
+
+def build(spec: tuple, output_dir: str):
+    """Generate one SPECS entry and write its .sub file."""
+    heading, filename, generate, kwargs, preset = spec
+    print(f"\n=== {heading} ===")
     write_sub_file(
-        os.path.join(OUTPUT_DIR, "test_scher_khan.sub"),
+        os.path.join(output_dir, filename),
         frequency=433920000,
-        preset="FuriHalSubGhzPresetOok650Async",
+        preset=preset,
         protocol="RAW",
-        pulses=scher_khan_pulses,
+        pulses=cached_pulses(generate, **kwargs),
         repeats=3
     )
 
+
+def main(parallel: bool = False):
+    # Usually already there: one stat instead of makedirs' walk
+    if not os.path.isdir(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    if parallel:
+        # One worker process per file (--parallel). Each spec is
+        # independent and CPU-bound; their output sections may interleave.
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=len(SPECS),
+                                 initializer=_setup_logging) as pool:
+            for job in [pool.submit(build, spec, OUTPUT_DIR) for spec in SPECS]:
+                job.result()
+    else:
+        for spec in SPECS:
+            build(spec, OUTPUT_DIR)
+
     print("\n=== All test .sub files generated ===")
     print(f"Output directory: {OUTPUT_DIR}")
     print("\nExpected firmware decode results:")
@@ -343,4 +503,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    _check_crc8_table()
+    _setup_logging()
+    main(parallel="--parallel" in sys.argv[1:])
@@ -0,0 +1,49 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled PWM encoders for generate_test_sub.py (optional).
+
+Same results as the pure-Python pwm_bit_pulses / pwm_pair_pulses in
+generate_test_sub.py, which picks these up when the extension is built:
+
+  pip install cython
+  cythonize -i tools/pulses_ext.pyx
+"""
+
+from cpython cimport array
+import array
+
+cdef array.array _INT_TEMPLATE = array.array("i")
+
+
+def pwm_bit_pulses(unsigned long long data, int nbits, int one, int zero, int low) -> array.array:
+    """PWM-encode the low `nbits` of `data`, MSB first.
+
+    Each bit becomes a HIGH of `one` or `zero` followed by the `low` separator.
+    """
+    cdef array.array out = array.clone(_INT_TEMPLATE, 2 * nbits, zero=False)
+    cdef int[::1] buf = out
+    cdef int bit_pos, delta = one - zero
+    cdef Py_ssize_t k = 0
+    for bit_pos in range(nbits - 1, -1, -1):
+        # Branchless select: zero + bit * (one - zero)
+        buf[k] = zero + <int>((data >> bit_pos) & 1) * delta
+        buf[k + 1] = low
+        k += 2
+    return out
+
+
+def pwm_pair_pulses(unsigned long long data, int nbits, int one, int zero) -> array.array:
+    """PWM-encode the low `nbits` of `data`, MSB first, as symmetric pairs.
+
+    Each bit becomes a HIGH and a LOW of the same width, `one` or `zero`.
+    """
+    cdef array.array out = array.clone(_INT_TEMPLATE, 2 * nbits, zero=False)
+    cdef int[::1] buf = out
+    cdef int bit_pos, w, delta = one - zero
+    cdef Py_ssize_t k = 0
+    for bit_pos in range(nbits - 1, -1, -1):
+        w = zero + <int>((data >> bit_pos) & 1) * delta
+        buf[k] = w
+        buf[k + 1] = -w
+        k += 2
+    return out
@@ -0,0 +1,68 @@
+"""
+Scher-Khan test-frame generator for MicroPython targets (@micropython.viper).
+
+Standalone counterpart of generate_scher_khan_pulses() in generate_test_sub.py:
+only `array` and `micropython`, so the file can be copied to a board as is:
+
+  mpremote cp tools/sk_viper.py :
+  >>> import sk_viper
+  >>> pulses = sk_viper.scher_khan_pulses(0x5ABDF34)
+
+On CPython the decorator is a no-op and the kernel runs as plain Python.
+"""
+
+from array import array
+
+# MicroPython only compiles @micropython.viper when spelled out literally,
+# so on CPython stand in a module whose decorators are no-ops.
+try:
+    import micropython
+except ImportError:
+    class micropython:
+        native = viper = staticmethod(lambda f: f)
+
+# Viper's 32-bit pointer type. MicroPython resolves viper annotations at
+# compile time; CPython evaluates them at def time and needs the name.
+ptr32 = array
+
+# Frame size: 3 header pairs + start bit + 50 data pairs + stop bit/end gap
+SK_FRAME_LEN = 110
+
+
+@micropython.viper
+def _sk_viper(hi: int, lo: int, out: ptr32) -> int:
+    """Fill `out` with a Scher-Khan frame; data is split in two 25-bit halves.
+
+    Viper ints are machine words, so the 50 data bits can't be passed whole.
+    Returns the number of pulses written (110).
+    """
+    k = 0
+    while k < 6:
+        out[k] = 1500
+        out[k + 1] = -750
+        k += 2
+    out[6] = 750
+    out[7] = -750
+    k = 8
+    word = hi
+    half = 0
+    while half < 2:
+        b = 24
+        while b >= 0:
+            w = 750 + ((word >> b) & 1) * 350
+            out[k] = w
+            out[k + 1] = -w
+            k += 2
+            b -= 1
+        word = lo
+        half += 1
+    out[k] = 2000
+    out[k + 1] = -3000
+    return k + 2
+
+
+def scher_khan_pulses(data_50bits: int) -> array:
+    """Scher-Khan 51-bit Dynamic pulse durations, as generate_scher_khan_pulses()."""
+    out = array("i", [0] * SK_FRAME_LEN)
+    _sk_viper(data_50bits >> 25, data_50bits & 0x1FFFFFF, out)
+    return out